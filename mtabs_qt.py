@@ -1,63 +1,419 @@
-from PyQt5.QtWidgets import QApplication, QMainWindow, QTabWidget, QWidget, QVBoxLayout, QAction, QDialog, QFormLayout, QLineEdit, QComboBox, QPushButton, QMessageBox, QLabel, QSizePolicy, QTabBar, QMenu, QToolButton, QTabWidget, QHBoxLayout, QCheckBox, QColorDialog, QGridLayout
-from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QApplication, QMainWindow, QTabWidget, QWidget, QVBoxLayout, QAction, QDialog, QFormLayout, QLineEdit, QComboBox, QPushButton, QMessageBox, QLabel, QSizePolicy, QTabBar, QMenu, QHBoxLayout, QCheckBox, QPlainTextEdit, QToolTip
+from PyQt5.QtGui import QIntValidator
+from PyQt5.QtCore import Qt, QPoint, QTimer, QFileSystemWatcher, QRunnable, QThreadPool, pyqtSignal, pyqtSlot
 from PyQt5.QAxContainer import QAxWidget
+from PyQt5 import sip
 import sys
+import base64
 import os
-from cryptography.fernet import Fernet
-from functools import partial
+import json
+import copy
+import socket
+import logging
+import hashlib
+import time
+import threading
+from functools import partial, lru_cache
+from collections import namedtuple, deque
+from pathlib import Path
+
+log = logging.getLogger(__name__)
 
 FAVORITES_FILE = 'favoritos.dat'
+# Chave Fernet do formato antigo, usada apenas para migrar os favoritos
 FAVORITES_KEY_FILE = 'favoritos.key'
+# Chave AES-256-GCM própria dos favoritos no formato atual
+FAVORITES_GCM_KEY_FILE = 'favoritos.gcm.key'
+# Prefixo dos arquivos de favoritos em AES-GCM; arquivos sem ele são tokens Fernet (formato antigo)
+FAVORITES_MAGIC = b'MTG2'
+# Prefixo dos arquivos em AES-GCM cifrados com os bytes da chave Fernet (formato antigo)
+FAVORITES_MAGIC_V1 = b'MTG1'
+FAVORITES_NONCE_SIZE = 12
+FAVORITES_SAVE_DELAY_MS = 500
+# Espera antes de tentar de novo uma gravação dos favoritos que falhou (ex.: arquivo em uso)
+FAVORITES_RETRY_DELAY_MS = 5000
+# Tentativas automáticas após uma falha antes de avisar o usuário
+FAVORITES_SAVE_RETRIES = 3
+RESIZE_DEBOUNCE_MS = 50
+CONNECT_REPEAT_INTERVAL = 0.5
+AX_EXCEPTIONS_MAX = 100
+RDP_CONTROL = 'MsTscAx.MsTscAx.7'
+RDP_DEFAULT_PORT = 3389
+FAVORITE_DEFAULT_NAME = 'Favorito'
+
+_TAB_STYLE = """
+    QTabBar::tab {
+        height: 20px;
+    }
+    QTabBar::tab:selected {
+        height: 27px;
+    }
+"""
+
+_MENU_STYLE = """
+    QMenuBar { background: #f0f0f0; }
+    QMenuBar::item { background: transparent; color: #222; }
+    QMenuBar::item:selected { background: #b3d7f3; color: #111; border: 0.5px solid #0078d7; }
+    QMenu {
+        background: #f5f5f5;
+        color: #222;
+        border: 1px solid #aaa;
+    }
+    QMenu::item {
+        background: transparent;
+        color: #222;
+    }
+    QMenu::item:selected {
+        background: #b3d7f3;
+        color: #111;
+        border: 0.5px solid #0078d7;
+    }
+"""
+
+_RDP_STYLE = "border: none; background: transparent;"
+
+_WELCOME_STYLE = "background: #ffffff;"
+_WELCOME_TITLE_STYLE = "background: #d3d3d3; font-weight: bold; font-size: 18px; padding: 8px; border: none;"
+_WELCOME_MSG_STYLE = "margin: 18px 0 18px 0; color: #444;"
 
-def generate_key():
+# Dados de uma conexão salva; nos favoritos, folhas são Connection e pastas são dict
+Connection = namedtuple('Connection', ['host', 'username', 'password', 'domain', 'port', 'nla'],
+                        defaults=('', RDP_DEFAULT_PORT, True))
+
+_key = None
+_legacy_key = None
+_fernet = None
+_aesgcm = None
+_port_validator_instance = None
+# Hash do conteúdo (texto claro) da última gravação dos favoritos
+_saved_digest = None
+# Protege _saved_digest e a gravação do arquivo, usados pela thread da interface e pelo pool de gravação
+_favorites_lock = threading.RLock()
+
+def load_key():
     """
-    Gera e salva uma chave de criptografia para os favoritos, se não existir.
-    Não recebe parâmetros e não retorna nada.
+    Carrega a chave AES-256-GCM dos favoritos do arquivo, gerando e salvando
+    uma nova se o arquivo não existir. A chave fica em memória após a primeira leitura.
+    Retorna:
+        bytes: chave carregada (32 bytes).
     """
-    if not os.path.exists(FAVORITES_KEY_FILE):
-        key = Fernet.generate_key()
-        with open(FAVORITES_KEY_FILE, 'wb') as f:
-            f.write(key)
+    global _key
+    if _key is None:
+        try:
+            _key = Path(FAVORITES_GCM_KEY_FILE).read_bytes()
+        except FileNotFoundError:
+            from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+            _key = AESGCM.generate_key(bit_length=256)
+            Path(FAVORITES_GCM_KEY_FILE).write_bytes(_key)
+    return _key
 
-def load_key():
+def _load_legacy_key():
+    """
+    Carrega a chave Fernet do formato antigo dos favoritos, usada apenas na migração.
+    Retorna:
+        bytes: chave Fernet (32 bytes em base64).
+    """
+    global _legacy_key
+    if _legacy_key is None:
+        _legacy_key = Path(FAVORITES_KEY_FILE).read_bytes()
+    return _legacy_key
+
+def _get_fernet():
+    """
+    Retorna a instância de Fernet dos favoritos, criada uma única vez por processo.
+    Usada apenas para ler arquivos no formato antigo, antes da troca para AES-GCM.
+    Retorna:
+        Fernet: instância pronta para criptografar/descriptografar.
+    """
+    global _fernet
+    if _fernet is None:
+        # Importado só no primeiro acesso aos favoritos: o cryptography é pesado de carregar
+        from cryptography.fernet import Fernet
+        _fernet = Fernet(_load_legacy_key())
+    return _fernet
+
+def _get_aesgcm():
+    """
+    Retorna a instância de AESGCM dos favoritos, criada uma única vez por processo,
+    com a chave de FAVORITES_GCM_KEY_FILE.
+    Retorna:
+        AESGCM: instância pronta para criptografar/descriptografar.
+    """
+    global _aesgcm
+    if _aesgcm is None:
+        from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+        _aesgcm = AESGCM(load_key())
+    return _aesgcm
+
+def _encrypt_favorites(data):
+    """
+    Criptografa os favoritos com AES-GCM.
+    Parâmetros:
+        data (bytes): conteúdo em texto claro.
+    Retorna:
+        bytes: FAVORITES_MAGIC + nonce + texto cifrado (com a tag de autenticação).
+    """
+    nonce = os.urandom(FAVORITES_NONCE_SIZE)
+    return FAVORITES_MAGIC + nonce + _get_aesgcm().encrypt(nonce, data, FAVORITES_MAGIC)
+
+def _decrypt_favorites(encrypted, aesgcm, magic):
+    """
+    Descriptografa favoritos gravados em AES-GCM.
+    Parâmetros:
+        encrypted (bytes): conteúdo do arquivo, começando por magic.
+        aesgcm (AESGCM): instância com a chave do formato do arquivo.
+        magic (bytes): prefixo do formato, usado também como dado autenticado.
+    Retorna:
+        bytes: conteúdo em texto claro.
+    """
+    start = len(magic)
+    nonce = encrypted[start:start + FAVORITES_NONCE_SIZE]
+    return aesgcm.decrypt(nonce, encrypted[start + FAVORITES_NONCE_SIZE:], magic)
+
+def _make_connection(conn_data):
+    """
+    Cria uma Connection a partir de um dicionário de dados de conexão, ignorando chaves desconhecidas.
+    Parâmetros:
+        conn_data (dict): dados da conexão.
+    Retorna:
+        Connection: dados da conexão.
+    """
+    return Connection(**{k: conn_data[k] for k in Connection._fields if k in conn_data})
+
+def _favorites_from_plain(node):
+    """
+    Converte a árvore de favoritos lida do arquivo, trocando os dicionários de conexão por Connection.
+    A distinção entre pasta e conexão é feita uma única vez, aqui.
+    Parâmetros:
+        node (dict): pasta de favoritos com dicionários simples.
+    Retorna:
+        dict: pasta de favoritos com folhas Connection.
+    """
+    tree = {}
+    for key, value in node.items():
+        if isinstance(value, dict):
+            if all(k in value for k in ('host', 'username', 'password')):
+                value = _make_connection(value)
+            else:
+                value = _favorites_from_plain(value)
+        tree[key] = value
+    return tree
+
+def _favorites_to_plain(node):
     """
-    Carrega a chave de criptografia dos favoritos do arquivo.
+    Converte a árvore de favoritos para dicionários simples, prontos para serializar em JSON.
+    Parâmetros:
+        node (dict): pasta de favoritos com folhas Connection.
     Retorna:
-        bytes: chave carregada.
+        dict: pasta de favoritos com dicionários simples.
     """
-    with open(FAVORITES_KEY_FILE, 'rb') as f:
-        return f.read()
+    return {key: value._asdict() if isinstance(value, Connection) else _favorites_to_plain(value)
+            for key, value in node.items()}
+
+def _merge_favorites(external, local):
+    """
+    Junta os favoritos lidos do arquivo (alterados por outra instância) com os favoritos locais.
+    Pastas presentes nos dois lados são juntadas recursivamente; nos demais conflitos vale o local.
+    Parâmetros:
+        external (dict): pasta de favoritos lida do arquivo.
+        local (dict): pasta de favoritos em memória.
+    Retorna:
+        dict: pasta de favoritos resultante.
+    """
+    merged = dict(external)
+    for key, value in local.items():
+        other = merged.get(key)
+        if isinstance(value, dict) and isinstance(other, dict):
+            merged[key] = _merge_favorites(other, value)
+        else:
+            merged[key] = value
+    return merged
 
 def save_favorites_encrypted(favorites):
     """
-    Salva os favoritos em arquivo criptografado.
+    Salva os favoritos em arquivo criptografado (JSON cifrado com AES-GCM).
+    Não grava nada se o conteúdo for igual ao da última gravação. A escrita é feita
+    em um arquivo temporário que substitui o original, para não corromper os favoritos
+    se o processo for interrompido no meio.
     Parâmetros:
         favorites (dict): dicionário de favoritos.
     Não retorna nada.
     """
-    import pickle
-    key = load_key()
-    fernet = Fernet(key)
-    data = pickle.dumps(favorites)
-    encrypted = fernet.encrypt(data)
-    with open(FAVORITES_FILE, 'wb') as f:
-        f.write(encrypted)
+    global _saved_digest
+    data = json.dumps(_favorites_to_plain(favorites), separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    digest = hashlib.blake2b(data, digest_size=16).digest()
+    with _favorites_lock:
+        if digest == _saved_digest:
+            return
+        encrypted = _encrypt_favorites(data)
+        tmp_file = FAVORITES_FILE + '.tmp'
+        Path(tmp_file).write_bytes(encrypted)
+        os.replace(tmp_file, FAVORITES_FILE)
+        _saved_digest = digest
 
 def load_favorites_encrypted():
     """
     Carrega os favoritos de um arquivo criptografado.
+    Arquivos antigos (token Fernet e/ou conteúdo em pickle) continuam sendo lidos
+    e são regravados no formato atual (JSON com AES-GCM).
     Retorna:
-        dict: dicionário de favoritos, ou {} se não existir.
+        dict: dicionário de favoritos (folhas Connection), ou {} se não existir.
     """
-    import pickle
-    if not os.path.exists(FAVORITES_FILE) or not os.path.exists(FAVORITES_KEY_FILE):
+    global _saved_digest
+    try:
+        encrypted = Path(FAVORITES_FILE).read_bytes()
+    except FileNotFoundError:
+        return {}
+    legacy = not encrypted.startswith(FAVORITES_MAGIC)
+    if not legacy:
+        if _key is None and not os.path.exists(FAVORITES_GCM_KEY_FILE):
+            return {}
+        data = _decrypt_favorites(encrypted, _get_aesgcm(), FAVORITES_MAGIC)
+    elif not os.path.exists(FAVORITES_KEY_FILE):
         return {}
-    key = load_key()
-    fernet = Fernet(key)
-    with open(FAVORITES_FILE, 'rb') as f:
-        encrypted = f.read()
-    data = fernet.decrypt(encrypted)
-    return pickle.loads(data)
+    elif encrypted.startswith(FAVORITES_MAGIC_V1):
+        # Formato legado: AES-GCM com os bytes da chave Fernet, antes da chave própria
+        from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+        aesgcm = AESGCM(base64.urlsafe_b64decode(_load_legacy_key()))
+        data = _decrypt_favorites(encrypted, aesgcm, FAVORITES_MAGIC_V1)
+    else:
+        # Formato legado (token Fernet), anterior à troca para AES-GCM
+        data = _get_fernet().decrypt(encrypted)
+    # O texto cifrado não é mais necessário: libera-o antes de montar a árvore de favoritos
+    del encrypted
+    try:
+        favorites = _favorites_from_plain(json.loads(data.decode('utf-8')))
+    except ValueError:
+        # Formato legado (pickle), anterior à troca para JSON
+        import pickle
+        favorites = _favorites_from_plain(pickle.loads(data))
+        legacy = True
+    if legacy:
+        # Migra o arquivo para o formato atual uma única vez
+        with _favorites_lock:
+            _saved_digest = None
+            try:
+                save_favorites_encrypted(favorites)
+            except OSError as e:
+                log.error("Erro ao migrar favoritos para o formato atual: %s", e)
+    else:
+        digest = hashlib.blake2b(data, digest_size=16).digest()
+        with _favorites_lock:
+            _saved_digest = digest
+    return favorites
+
+def _favorites_file_signature():
+    """
+    Retorna uma assinatura barata do arquivo de favoritos (data de modificação e tamanho),
+    usada para reconhecer as gravações feitas por este processo sem ler o arquivo.
+    Retorna:
+        tuple: (st_mtime_ns, st_size), ou None se o arquivo não existir.
+    """
+    try:
+        st = os.stat(FAVORITES_FILE)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+def _port_validator():
+    """
+    Retorna o validador dos campos de porta RDP, criado uma única vez e compartilhado por todos os formulários.
+    O validador pertence ao QApplication atual; se esse QApplication já foi destruído
+    (ex.: outro QApplication criado depois no mesmo processo), um novo validador é criado.
+    Retorna:
+        QIntValidator: validador de 1 a 65535.
+    """
+    global _port_validator_instance
+    if _port_validator_instance is None or sip.isdeleted(_port_validator_instance):
+        _port_validator_instance = QIntValidator(1, 65535, QApplication.instance())
+    return _port_validator_instance
+
+@lru_cache(maxsize=256)
+def _resolve_hostname(host):
+    """
+    Resolve o nome do computador remoto via DNS reverso. O resultado fica em cache.
+    Parâmetros:
+        host (str): endereço do host remoto (IP ou hostname).
+    Retorna:
+        str: nome resolvido, ou o próprio host se a resolução falhar.
+    """
+    try:
+        return socket.gethostbyaddr(host)[0]
+    except (OSError, UnicodeError):
+        return host
+
+class _HostnameResolver(QRunnable):
+    """
+    Tarefa do QThreadPool que resolve o nome de um host fora da thread da interface.
+    Parâmetros:
+        host (str): endereço do host remoto.
+        callback (callable): função chamada com o nome resolvido (na thread do pool).
+    """
+    def __init__(self, host, callback):
+        super().__init__()
+        self._host = host
+        self._callback = callback
+
+    def run(self):
+        """
+        Executa a resolução e entrega o resultado ao callback.
+        Não recebe parâmetros e não retorna nada.
+        """
+        try:
+            self._callback(_resolve_hostname(self._host))
+        except Exception as e:
+            # Ex.: a janela que receberia o resultado já foi destruída
+            log.debug("Erro ao entregar nome resolvido de %s: %s", self._host, e)
+
+class _FavoritesSaver(QRunnable):
+    """
+    Tarefa do QThreadPool que grava uma cópia dos favoritos fora da thread da interface.
+    Parâmetros:
+        favorites (dict): cópia dos favoritos a ser gravada.
+        callback (callable): função chamada (na thread do pool) com a assinatura do arquivo após a gravação.
+        error_callback (callable): função chamada (na thread do pool) com a mensagem de erro, se a gravação falhar.
+    """
+    def __init__(self, favorites, callback, error_callback):
+        super().__init__()
+        self._favorites = favorites
+        self._callback = callback
+        self._error_callback = error_callback
+
+    def run(self):
+        """
+        Criptografa e grava os favoritos e avisa o callback (ou o error_callback, em caso de falha).
+        Não recebe parâmetros e não retorna nada.
+        """
+        try:
+            save_favorites_encrypted(self._favorites)
+        except Exception as e:
+            log.error("Erro ao salvar favoritos: %s", e)
+            self._error_callback(str(e))
+            return
+        self._callback(_favorites_file_signature())
+
+class _FavoritesLoader(QRunnable):
+    """
+    Tarefa do QThreadPool que relê os favoritos do arquivo fora da thread da interface.
+    Roda no mesmo pool (de uma thread) das gravações, em ordem com elas.
+    Parâmetros:
+        callback (callable): função chamada (na thread do pool) com (assinatura do arquivo, favoritos lidos).
+    """
+    def __init__(self, callback):
+        super().__init__()
+        self._callback = callback
+
+    def run(self):
+        """
+        Lê e descriptografa os favoritos e entrega o resultado ao callback.
+        Não recebe parâmetros e não retorna nada.
+        """
+        try:
+            # Assinatura tirada antes da leitura: se o arquivo mudar no meio, o próximo aviso não é ignorado
+            signature = _favorites_file_signature()
+            self._callback((signature, load_favorites_encrypted()))
+        except Exception as e:
+            log.debug("Falha ao recarregar favoritos: %s", e)
 
 class RDPWidget(QWidget):
     """
@@ -70,17 +426,20 @@ class RDPWidget(QWidget):
         port (int): porta do RDP.
         nla (bool): True para NLA, False para Legacy.
     """
+    # Exceções do ActiveX: (host, code, source, desc, help)
+    ax_exception = pyqtSignal(str, int, str, str, str)
+
     def _get_initial_size(self):
         """
         Retorna o tamanho inicial do widget para ser usado como resolução da sessão RDP.
         Retorna:
             tuple: (width, height) inteiros.
         """
-        width = self.width() if self.width() > 0 else 900
-        height = self.height() if self.height() > 0 else 600
+        width = self.width() or 900
+        height = self.height() or 600
         return width, height
 
-    def __init__(self, host, username, password, domain='', port=3389, nla=True, parent=None):
+    def __init__(self, host, username, password, domain='', port=RDP_DEFAULT_PORT, nla=True, parent=None):
         """
         Inicializa o widget de conexão RDP usando o ActiveX do Windows.
         Parâmetros:
@@ -97,12 +456,24 @@ class RDPWidget(QWidget):
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
         layout.setSpacing(0)
-        self.rdp = QAxWidget('MsTscAx.MsTscAx.7')
+        self.rdp = QAxWidget(RDP_CONTROL)
+        self._adv = None
+        self._log_callback = None
+        # A conexão é iniciada uma única vez, na primeira exibição
+        self._connect_started = False
+        # Indica se o slot de reconexão está ligado ao OnDisconnected (reconexão em andamento)
+        self._reconnect_slot_connected = False
         self.rdp.exception.connect(self.handle_ax_exception)
         self.rdp.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         layout.addWidget(self.rdp)
         layout.setAlignment(self.rdp, Qt.AlignTop | Qt.AlignLeft)
         self.setLayout(layout)
+        # Agrupa os redimensionamentos de um arraste em um único resize do controle
+        self._pending_size = None
+        self._resize_timer = QTimer(self)
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.setInterval(RESIZE_DEBOUNCE_MS)
+        self._resize_timer.timeout.connect(self._apply_resize)
         # Não conecta nem define resolução aqui, faz isso no showEvent
         self._rdp_config = {
             'host': host,
@@ -112,6 +483,16 @@ class RDPWidget(QWidget):
             'port': port,
             'nla': nla
         }
+        # Propriedades fixas da sessão, montadas uma única vez; Domain e RDPPort só quando diferem do padrão
+        rdp_props = [('Server', host), ('UserName', username)]
+        if domain:
+            rdp_props.append(('Domain', domain))
+        self._rdp_props = tuple(rdp_props)
+        adv_props = [('ClearTextPassword', password), ('AuthenticationLevel', 2 if nla else 0)]
+        if port != RDP_DEFAULT_PORT:
+            adv_props.append(('RDPPort', port))
+        adv_props.append(('DisplayConnectionBar', True))
+        self._adv_props = tuple(adv_props)
 
     def set_log_callback(self, log_callback):
         """
@@ -130,79 +511,91 @@ class RDPWidget(QWidget):
             level (str): nível da mensagem (INFO, ERRO, etc).
         Não retorna nada.
         """
-        if hasattr(self, '_log_callback') and self._log_callback:
+        if self._log_callback:
             self._log_callback(msg, level)
 
     def showEvent(self, event):
         """
-        Evento chamado quando o widget é exibido pela primeira vez.
-        Ajusta a resolução do RDP para o tamanho real do QAxWidget e conecta.
+        Evento chamado quando o widget é exibido.
+        Na primeira exibição, ajusta a resolução do RDP para o tamanho real do widget e conecta;
+        nas seguintes (ex.: troca de aba) não faz nada além do comportamento padrão.
         Parâmetros:
             event (QShowEvent): evento de exibição.
         Não retorna nada.
         """
-        import time
         super().showEvent(event)
-        start = time.time()
+        if self._connect_started:
+            return
+        self._connect_started = True
+        start = time.perf_counter()
         self._log(f"Iniciando conexão com {self._rdp_config['host']}...", "INFO")
-        width = self.rdp.width() if self.rdp.width() > 0 else 900
-        height = self.rdp.height() if self.rdp.height() > 0 else 600
         try:
-            self.rdp.setProperty('Server', self._rdp_config['host'])
-            self.rdp.setProperty('UserName', self._rdp_config['username'])
-            if self._rdp_config['domain']:
-                self.rdp.setProperty('Domain', self._rdp_config['domain'])
-            self.rdp.setProperty('DesktopWidth', width)
-            self.rdp.setProperty('DesktopHeight', height)
-            adv = self.rdp.querySubObject("AdvancedSettings")
-            if adv:
-                adv.setProperty("ClearTextPassword", self._rdp_config['password'])
-                adv.setProperty("AuthenticationLevel", 2 if self._rdp_config['nla'] else 0)
-                if self._rdp_config['port'] != 3389:
-                    adv.setProperty("RDPPort", self._rdp_config['port'])
-                adv.setProperty("DisplayConnectionBar", True)
-                adv.setProperty("DesktopWidth", width)
-                adv.setProperty("DesktopHeight", height)
-            self.rdp.dynamicCall('Connect()')
-            elapsed = time.time() - start
+            self._configure_and_connect()
+            elapsed = time.perf_counter() - start
             self._log(f"Conexão iniciada para {self._rdp_config['host']} (tempo: {elapsed:.2f}s)", "INFO")
         except Exception as e:
             self._log(f"Erro ao conectar em {self._rdp_config['host']}: {e}", "ERRO")
 
-    def _ajustar_resolucao_e_conectar(self):
+    def _advanced_settings(self):
         """
-        Ajusta a resolução do RDP para o tamanho atual do QAxWidget e conecta.
-        Não recebe parâmetros e não retorna nada.
+        Retorna o subobjeto AdvancedSettings do controle RDP atual, consultado uma única vez por controle.
+        Retorna:
+            QAxObject: subobjeto AdvancedSettings, ou None se indisponível.
+        """
+        if self._adv is None:
+            self._adv = self.rdp.querySubObject("AdvancedSettings")
+        return self._adv
+
+    def _apply_rdp_properties(self, width, height):
         """
-        width = self.rdp.width() if self.rdp.width() > 0 else 900
-        height = self.rdp.height() if self.rdp.height() > 0 else 600
-        print(f"Resolução inicial do QAxWidget para o RDP: {width}x{height}")
-        self.rdp.setProperty('DesktopWidth', width)
-        self.rdp.setProperty('DesktopHeight', height)
-        adv = self.rdp.querySubObject("AdvancedSettings")
+        Aplica no controle RDP as propriedades da sessão, escrevendo cada uma uma única vez.
+        As propriedades fixas vêm prontas de __init__; só a resolução é definida aqui.
+        Parâmetros:
+            width (int): largura da área de trabalho remota.
+            height (int): altura da área de trabalho remota.
+        Não retorna nada.
+        """
+        setp = self.rdp.setProperty
+        for name, value in self._rdp_props:
+            setp(name, value)
+        setp('DesktopWidth', width)
+        setp('DesktopHeight', height)
+        adv = self._advanced_settings()
         if adv:
-            adv.setProperty("DesktopWidth", width)
-            adv.setProperty("DesktopHeight", height)
-        self.rdp.dynamicCall('Connect()')
+            setp = adv.setProperty
+            for name, value in self._adv_props:
+                setp(name, value)
 
     def resizeEvent(self, event):
         """
         Evento chamado quando o widget é redimensionado.
-        Imprime o tamanho atual do QAxWidget e ajusta o tamanho visual do controle.
+        Guarda o novo tamanho e agenda o ajuste do controle, para que um arraste
+        da janela resulte em um único resize no ActiveX.
         Parâmetros:
             event (QResizeEvent): evento de redimensionamento.
         Não retorna nada.
         """
         super().resizeEvent(event)
-        width = self.width()
-        height = self.height()
+        self._pending_size = (self.width(), self.height())
+        self._resize_timer.start()
+
+    @pyqtSlot()
+    def _apply_resize(self):
+        """
+        Ajusta o tamanho visual do controle para o último tamanho pendente e registra no log (nível DEBUG).
+        Não recebe parâmetros e não retorna nada.
+        """
+        if self.rdp is None or self._pending_size is None:
+            return
+        width, height = self._pending_size
         self.rdp.resize(width, height)
-        print(f"Tamanho atual do QAxWidget (RDP): {self.rdp.width()}x{self.rdp.height()}")
+        log.debug("Tamanho atual do QAxWidget (RDP): %dx%d", width, height)
         # Não altera resolução do RDP após conexão
 
+    @pyqtSlot(int, str, str, str)
     def handle_ax_exception(self, code, source, desc, help):
         """
-        Slot para tratar exceções do QAxWidget.
+        Slot para tratar exceções do QAxWidget. Repassa a exceção pelo sinal ax_exception.
         Parâmetros:
             code (int): código do erro.
             source (str): fonte do erro.
@@ -211,45 +604,110 @@ class RDPWidget(QWidget):
         Não retorna nada.
         """
         self._log(f"Exceção QAxWidget: code={code}, source={source}, desc={desc}, help={help}", "ERRO")
-        print(f"Exceção QAxWidget: code={code}, source={source}, desc={desc}, help={help}")
+        self.ax_exception.emit(self._rdp_config['host'], code, source, desc, help)
+
+    def release(self):
+        """
+        Libera o controle RDP da aba (chamado ao fechar a aba): cancela uma reconexão pendente
+        e encerra a sessão. O controle é destruído junto com o widget da aba.
+        Não recebe parâmetros e não retorna nada.
+        """
+        rdp = self.rdp
+        if rdp is None:
+            return
+        self.rdp = None
+        self._adv = None
+        rdp.exception.disconnect(self.handle_ax_exception)
+        if self._reconnect_slot_connected:
+            # Cancela uma reconexão pendente: o controle não pertence mais a esta aba
+            rdp.OnDisconnected.disconnect(self._reconnect_after_disconnect)
+            self._reconnect_slot_connected = False
+        if rdp.property('Connected'):
+            rdp.dynamicCall('Disconnect()')
+
+    def reconnect_rdp(self, force=False):
+        """
+        Reconecta a sessão RDP reaproveitando o QAxWidget atual: se conectado, desconecta,
+        aguarda o evento OnDisconnected e conecta novamente com as mesmas configurações.
+        Com force=True, destrói o QAxWidget antigo e cria um novo, garantindo que a tela
+        branca não ocorra após reconexão.
+        Parâmetros:
+            force (bool): recria o controle ActiveX em vez de reaproveitá-lo.
+        Não retorna nada.
+        """
+        if force:
+            self._recreate_and_connect()
+        elif self._reconnect_slot_connected:
+            # Já há uma reconexão aguardando o OnDisconnected
+            return
+        elif self.rdp.property('Connected'):
+            self.rdp.OnDisconnected.connect(self._reconnect_after_disconnect)
+            self._reconnect_slot_connected = True
+            self.rdp.dynamicCall('Disconnect()')
+        else:
+            self._configure_and_connect()
+            self._repaint_after_reconnect()
+
+    @pyqtSlot(int)
+    def _reconnect_after_disconnect(self, reason):
+        """
+        Slot de uso único do OnDisconnected: conecta novamente assim que a sessão anterior termina.
+        Parâmetros:
+            reason (int): código do motivo da desconexão (ignorado).
+        Não retorna nada.
+        """
+        self.rdp.OnDisconnected.disconnect(self._reconnect_after_disconnect)
+        self._reconnect_slot_connected = False
+        self._configure_and_connect()
+        self._repaint_after_reconnect()
+
+    def _repaint_after_reconnect(self):
+        """
+        Força o redesenho do controle e da aba após uma reconexão, evitando a tela branca.
+        Não recebe parâmetros e não retorna nada.
+        """
+        self.rdp.repaint()
+        self.rdp.update()
+        self.repaint()
+        self.update()
+
+    def _configure_and_connect(self):
+        """
+        Aplica as configurações da sessão no controle atual, com a resolução do tamanho atual do widget, e conecta.
+        Único caminho de configuração + conexão, usado na primeira exibição e nas reconexões.
+        Não recebe parâmetros e não retorna nada.
+        """
+        width = self.width() or 900
+        height = self.height() or 600
+        log.debug("Resolução do RDP: %dx%d", width, height)
+        self._apply_rdp_properties(width, height)
+        self.rdp.dynamicCall('Connect()')
 
-    def reconnect_rdp(self):
+    def _recreate_and_connect(self):
         """
-        Reconecta a sessão RDP destruindo o QAxWidget antigo e criando um novo,
-        garantindo que a tela branca não ocorra após reconexão.
+        Destrói o QAxWidget atual, cria um novo no lugar e conecta.
+        Uma reconexão pendente no controle antigo é cancelada antes, para não disparar depois.
         Não recebe parâmetros e não retorna nada.
         """
         layout = self.layout()
         if self.rdp:
+            if self._reconnect_slot_connected:
+                self.rdp.OnDisconnected.disconnect(self._reconnect_after_disconnect)
+                self._reconnect_slot_connected = False
             layout.removeWidget(self.rdp)
             self.rdp.deleteLater()
             self.rdp = None
+            self._adv = None
         # Cria novo QAxWidget
-        self.rdp = QAxWidget('MsTscAx.MsTscAx.7')
+        self.rdp = QAxWidget(RDP_CONTROL)
         self.rdp.exception.connect(self.handle_ax_exception)
         self.rdp.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-        self.rdp.setStyleSheet("border: none; background: transparent;")
+        self.rdp.setStyleSheet(_RDP_STYLE)
         layout.addWidget(self.rdp)
         layout.setAlignment(self.rdp, Qt.AlignTop | Qt.AlignLeft)
-        width = self.width() if self.width() > 0 else 900
-        height = self.height() if self.height() > 0 else 600
-        self.rdp.resize(width, height)
-        self.rdp.setProperty('Server', self._rdp_config['host'])
-        self.rdp.setProperty('UserName', self._rdp_config['username'])
-        if self._rdp_config['domain']:
-            self.rdp.setProperty('Domain', self._rdp_config['domain'])
-        self.rdp.setProperty('DesktopWidth', width)
-        self.rdp.setProperty('DesktopHeight', height)
-        adv = self.rdp.querySubObject("AdvancedSettings")
-        if adv:
-            adv.setProperty("ClearTextPassword", self._rdp_config['password'])
-            adv.setProperty("AuthenticationLevel", 2 if self._rdp_config['nla'] else 0)
-            if self._rdp_config['port'] != 3389:
-                adv.setProperty("RDPPort", self._rdp_config['port'])
-            adv.setProperty("DisplayConnectionBar", True)
-            adv.setProperty("DesktopWidth", width)
-            adv.setProperty("DesktopHeight", height)
-        self.rdp.dynamicCall('Connect()')
+        self.rdp.resize(self.width() or 900, self.height() or 600)
+        self._configure_and_connect()
+        self._repaint_after_reconnect()
 
 class ConnectionDialog(QDialog):
     """
@@ -271,7 +729,8 @@ class ConnectionDialog(QDialog):
         self.pass_input.setEchoMode(QLineEdit.Password)
         self.domain_input = QLineEdit()
         self.port_input = QLineEdit()
-        self.port_input.setText('3389')
+        self.port_input.setText(str(RDP_DEFAULT_PORT))
+        self.port_input.setValidator(_port_validator())
         self.nla_combo = QComboBox()
         self.nla_combo.addItems(['NLA (Recomendado)', 'Legacy (Sem NLA)'])
         layout.addRow('Host:', self.host_input)
@@ -293,6 +752,7 @@ class ConnectionDialog(QDialog):
         layout.addRow(btn_ok)
         self._fav_data = None
 
+    @pyqtSlot()
     def _on_fav_clicked(self):
         """
         Salva os dados atuais do formulário como favorito (nome e pasta personalizados) e fecha o diálogo sem abrir a conexão.
@@ -303,23 +763,7 @@ class ConnectionDialog(QDialog):
         if not name:
             QMessageBox.warning(self, 'Favoritos', 'Informe um nome para o favorito.')
             return
-        host = self.host_input.text().strip()
-        username = self.user_input.text().strip()
-        password = self.pass_input.text()
-        domain = self.domain_input.text().strip()
-        try:
-            port = int(self.port_input.text())
-        except ValueError:
-            port = 3389
-        nla = self.nla_combo.currentIndex() == 0
-        self._fav_data = (name, folder, {
-            'host': host,
-            'username': username,
-            'password': password,
-            'domain': domain,
-            'port': port,
-            'nla': nla
-        })
+        self._fav_data = (name, folder, self.get_data())
         # Fecha o diálogo sem aceitar (não chama accept), apenas salva o favorito
         self.done(0)
 
@@ -332,24 +776,27 @@ class ConnectionDialog(QDialog):
 
     def get_data(self):
         """
-        Retorna os dados inseridos pelo usuário.
-        :return: tuple (host, username, password, domain, port, nla)
-        """
-        host = self.host_input.text().strip()
-        username = self.user_input.text().strip()
-        password = self.pass_input.text()
-        domain = self.domain_input.text().strip()
-        try:
-            port = int(self.port_input.text())
-        except ValueError:
-            port = 3389
-        nla = self.nla_combo.currentIndex() == 0
-        return (host, username, password, domain, port, nla)
+        Retorna os dados inseridos pelo usuário, lendo cada campo uma única vez.
+        :return: Connection (host, username, password, domain, port, nla)
+        """
+        # O validador só deixa passar dígitos; vazio ou fora da faixa usa a porta padrão
+        port = int(self.port_input.text()) if self.port_input.hasAcceptableInput() else RDP_DEFAULT_PORT
+        return Connection(
+            self.host_input.text().strip(),
+            self.user_input.text().strip(),
+            self.pass_input.text(),
+            self.domain_input.text().strip(),
+            port,
+            self.nla_combo.currentIndex() == 0
+        )
 
 class ClosableTabBar(QTabBar):
     """
     QTabBar customizado que permite fechar abas com o botão direito do mouse.
     """
+    # Índice da aba em que o menu de contexto foi aberto
+    _menu_index = -1
+
     def mousePressEvent(self, event):
         """
         Evento chamado ao pressionar o mouse sobre a barra de abas.
@@ -375,63 +822,51 @@ class ClosableTabBar(QTabBar):
         elif event.button() == Qt.RightButton:
             index = self.tabAt(event.pos())
             if index != -1:
+                self._menu_index = index
                 menu = QMenu(self)
-                def close_tab():
-                    """
-                    Fecha a aba selecionada.
-                    Não recebe parâmetros e não retorna nada.
-                    """
-                    self.parent().tabCloseRequested.emit(index)
-                def reconnect_tab():
-                    """
-                    Reconecta a sessão RDP da aba selecionada, aguardando o evento de desconexão para reconectar.
-                    Não recebe parâmetros e não retorna nada.
-                    """
-                    widget = self.parent().widget(index)
-                    if hasattr(widget, 'rdp'):
-                        rdp = widget.rdp
-                        def do_reconnect():
-                            width = rdp.width()
-                            height = rdp.height()
-                            rdp.setProperty('DesktopWidth', width)
-                            rdp.setProperty('DesktopHeight', height)
-                            adv = rdp.querySubObject("AdvancedSettings")
-                            if adv:
-                                adv.setProperty("DesktopWidth", width)
-                                adv.setProperty("DesktopHeight", height)
-                            rdp.dynamicCall('Connect()')
-                            rdp.repaint()
-                            rdp.update()
-                            widget.repaint()
-                            widget.update()
-                            try:
-                                rdp.OnDisconnected.disconnect(do_reconnect)
-                            except Exception:
-                                pass
-                        if rdp.property('Connected') == 1:
-                            try:
-                                rdp.OnDisconnected.disconnect(do_reconnect)
-                            except Exception:
-                                pass
-                            rdp.OnDisconnected.connect(do_reconnect)
-                            rdp.dynamicCall('Disconnect()')
-                        else:
-                            do_reconnect()
-                menu.addAction('Reconectar', reconnect_tab)
-                menu.addAction('Fechar aba', close_tab)
+                menu.addAction('Reconectar', self._reconnect_menu_tab)
+                menu.addAction('Fechar aba', self._close_menu_tab)
                 menu.exec_(event.globalPos())
         else:
             super().mouseReleaseEvent(event)
 
+    @pyqtSlot()
+    def _close_menu_tab(self):
+        """
+        Fecha a aba em que o menu de contexto foi aberto.
+        Não recebe parâmetros e não retorna nada.
+        """
+        self.parent().tabCloseRequested.emit(self._menu_index)
+
+    @pyqtSlot()
+    def _reconnect_menu_tab(self):
+        """
+        Reconecta a sessão RDP da aba em que o menu de contexto foi aberto,
+        reaproveitando o controle ActiveX (RDPWidget.reconnect_rdp).
+        Não recebe parâmetros e não retorna nada.
+        """
+        widget = self.parent().widget(self._menu_index)
+        if isinstance(widget, RDPWidget):
+            widget.reconnect_rdp()
+
 class MTabsMainWindow(QMainWindow):
     """
     Janela principal do aplicativo, gerencia as abas de conexões RDP.
     """
+    # Emitido (a partir do pool de resolução) com o widget da aba e o nome resolvido do computador
+    _host_resolved = pyqtSignal(object, str)
+    # Emitido (a partir do pool de gravação) com a assinatura do arquivo quando os favoritos terminam de ser gravados
+    _favorites_saved = pyqtSignal(object)
+    # Emitido (a partir do pool de gravação) com (assinatura, favoritos) relidos após uma mudança externa no arquivo
+    _favorites_reloaded = pyqtSignal(object)
+    # Emitido (a partir do pool de gravação) com a mensagem de erro quando a gravação falha
+    _favorites_save_failed = pyqtSignal(str)
+
     def __init__(self):
         """
         Inicializa a janela principal e o QTabWidget.
-        Inicializa também a estrutura de favoritos antes de criar o menu.
-        Carrega favoritos do arquivo criptografado.
+        Os favoritos só são carregados do arquivo criptografado na primeira
+        abertura do menu Favoritos (ou no primeiro favorito adicionado).
         """
         super().__init__()
         self.setWindowTitle('mTabs (Qt) - Gerenciador de Conexões RDP')
@@ -440,23 +875,50 @@ class MTabsMainWindow(QMainWindow):
         self.tab_widget.setTabBar(ClosableTabBar(self.tab_widget))
         self.tab_widget.setTabsClosable(True)
         self.tab_widget.setMovable(True)  # Permite arrastar as abas
-        self.tab_widget.setStyleSheet("""
-            QTabBar::tab {
-                height: 20px;
-            }
-            QTabBar::tab:selected {
-                height: 27px;
-            }
-        """)
+        self.tab_widget.setStyleSheet(_TAB_STYLE)
         self.setCentralWidget(self.tab_widget)
-        generate_key()
-        self.favorites = load_favorites_encrypted()
+        self.favorites = None
+        # Índices do menu de favoritos por caminho (tupla de nomes), para atualizações incrementais
+        self._fav_menus = {}
+        self._fav_actions = {}
+        # Gravação dos favoritos agrupada: várias adições seguidas geram uma única escrita
+        self._fav_dirty = False
+        self._fav_flush_timer = QTimer(self)
+        self._fav_flush_timer.setSingleShot(True)
+        self._fav_flush_timer.timeout.connect(self._flush_favorites)
+        # Gravações e releituras feitas em uma única thread de apoio, em ordem, sem travar a interface
+        self._fav_save_pool = QThreadPool(self)
+        self._fav_save_pool.setMaxThreadCount(1)
+        # Gravações agendadas e ainda não concluídas, e a assinatura do arquivo após a última delas
+        self._fav_saves_pending = 0
+        self._fav_own_signature = None
+        # Mudança no arquivo recebida durante uma gravação, conferida quando a gravação terminar
+        self._fav_recheck = False
+        # Falhas seguidas de gravação, para limitar as novas tentativas
+        self._fav_save_failures = 0
+        self._favorites_saved.connect(self._on_favorites_saved)
+        self._favorites_save_failed.connect(self._on_favorites_save_failed)
+        self._favorites_reloaded.connect(self._on_favorites_reloaded)
+        # Recarrega os favoritos quando o arquivo é alterado por outra instância ou externamente;
+        # o arquivo só passa a ser observado depois que os favoritos são carregados
+        self._fav_watcher = QFileSystemWatcher(self)
+        self._fav_watcher.fileChanged.connect(self._on_favorites_file_changed)
+        # Resoluções de nome das abas em um pool da própria janela, descartadas ao fechá-la
+        self._resolve_pool = QThreadPool(self)
         self._create_menu()
         self.tab_widget.tabCloseRequested.connect(self.close_tab)
         self.tab_widget.currentChanged.connect(self._update_window_title)
+        self._host_resolved.connect(self._on_host_resolved)
+        # Últimas exceções do ActiveX de todas as abas, consultadas pelo menu Debug
+        self._ax_exceptions = deque(maxlen=AX_EXCEPTIONS_MAX)
+        # Formulário da aba inicial, criado uma vez e reaproveitado sempre que todas as abas são fechadas
+        self._welcome_widget = NovaConexaoWidget()
+        self._welcome_widget.connect_requested.connect(self._on_welcome_connect)
+        self._welcome_widget.favorite_requested.connect(self._on_nova_conexao_favoritar)
         self._show_welcome()
         self.set_minimum_size_to_current()
 
+    @pyqtSlot(int)
     def _update_window_title(self, index):
         """
         Atualiza o título da janela para refletir o nome da aba ativa.
@@ -476,119 +938,316 @@ class MTabsMainWindow(QMainWindow):
         Não recebe parâmetros e não retorna nada.
         """
         menubar = self.menuBar()
-        menubar.setStyleSheet("""
-            QMenuBar { background: #f0f0f0; }
-            QMenuBar::item { background: transparent; color: #222; }
-            QMenuBar::item:selected { background: #b3d7f3; color: #111; border: 0.5px solid #0078d7; }
-            QMenu {
-                background: #f5f5f5;
-                color: #222;
-                border: 1px solid #aaa;
-            }
-            QMenu::item {
-                background: transparent;
-                color: #222;
-            }
-            QMenu::item:selected {
-                background: #b3d7f3;
-                color: #111;
-                border: 0.5px solid #0078d7;
-            }
-        """)
+        menubar.setStyleSheet(_MENU_STYLE)
         conex_menu = menubar.addMenu('Conexão')
         add_action = QAction('Adicionar conexão', self)
         add_action.triggered.connect(self.add_connection)
         conex_menu.addAction(add_action)
         # Menu de favoritos
         self.favorites_menu = menubar.addMenu('Favoritos')
-        self._update_favorites_menu()
-        # Menu de debug removido
+        self.favorites_menu.aboutToShow.connect(self._ensure_favorites_loaded)
+        # Um único slot atende todos os favoritos (inclusive os de submenus)
+        self.favorites_menu.triggered.connect(self._on_favorite_action_triggered)
+        # Menu de debug
+        debug_menu = menubar.addMenu('Debug')
+        ax_exceptions_action = QAction('Exceções RDP', self)
+        ax_exceptions_action.triggered.connect(self._show_ax_exceptions)
+        debug_menu.addAction(ax_exceptions_action)
+
+    @pyqtSlot()
+    def _ensure_favorites_loaded(self):
+        """
+        Carrega os favoritos do arquivo criptografado na primeira vez em que são necessários
+        e monta o menu de favoritos.
+        Não recebe parâmetros e não retorna nada.
+        """
+        if self.favorites is None:
+            # Leitura na thread da interface: antes dela, o pool de gravação não tem tarefas
+            self.favorites = load_favorites_encrypted()
+            self._update_favorites_menu()
+            self._watch_favorites_file()
 
     def _update_favorites_menu(self):
         """
-        Atualiza o menu de favoritos, criando submenus para pastas e ações para conexões salvas.
+        Reconstrói todo o menu de favoritos, criando submenus para pastas e ações para conexões salvas.
         O nome exibido será sempre o nome personalizado do favorito.
         Não recebe parâmetros e não retorna nada.
         """
         self.favorites_menu.clear()
-        def add_fav_items(menu, fav_dict):
+        self._fav_menus = {(): self.favorites_menu}
+        self._fav_actions = {}
+        # Percorre a árvore com uma pilha explícita; cada pasta preenche seu submenu na ordem original
+        stack = [(self.favorites_menu, self.favorites, ())]
+        while stack:
+            menu, fav_dict, path = stack.pop()
             for key, value in fav_dict.items():
-                if isinstance(value, dict) and not all(k in value for k in ('host', 'username', 'password')):
+                item_path = path + (key,)
+                if isinstance(value, dict):
                     submenu = menu.addMenu(key)
-                    add_fav_items(submenu, value)
+                    self._fav_menus[item_path] = submenu
+                    stack.append((submenu, value, item_path))
                 else:
                     # Exibe apenas o nome personalizado do favorito
                     action = QAction(key, self)
-                    action.triggered.connect(partial(self._open_favorite_connection, value))
+                    action.setData(value)
                     menu.addAction(action)
-        add_fav_items(self.favorites_menu, self.favorites)
+                    self._fav_actions[item_path] = action
+
+    def _add_favorite_menu_item(self, parts, name, conn_data):
+        """
+        Insere no menu de favoritos apenas a ação (e os submenus de pasta que faltarem)
+        de um favorito recém-adicionado, sem reconstruir o menu inteiro.
+        Se o favorito substituir uma pasta, ou uma pasta do caminho for um favorito,
+        o menu é reconstruído por completo.
+        Parâmetros:
+            parts (list): nomes das pastas do caminho do favorito.
+            name (str): nome personalizado do favorito.
+            conn_data (Connection): dados da conexão.
+        Não retorna nada.
+        """
+        menu = self.favorites_menu
+        path = ()
+        for part in parts:
+            path += (part,)
+            if path in self._fav_actions:
+                self._update_favorites_menu()
+                return
+            submenu = self._fav_menus.get(path)
+            if submenu is None:
+                submenu = menu.addMenu(part)
+                self._fav_menus[path] = submenu
+            menu = submenu
+        path += (name,)
+        if path in self._fav_menus:
+            self._update_favorites_menu()
+            return
+        action = self._fav_actions.get(path)
+        if action is None:
+            action = QAction(name, self)
+            menu.addAction(action)
+            self._fav_actions[path] = action
+        # Se o favorito foi sobrescrito, mantém a posição no menu e troca apenas os dados
+        action.setData(conn_data)
+
+    @pyqtSlot(QAction)
+    def _on_favorite_action_triggered(self, action):
+        """
+        Slot único do menu de favoritos: abre a conexão guardada nos dados da ação acionada.
+        Parâmetros:
+            action (QAction): ação acionada no menu de favoritos ou em um de seus submenus.
+        Não retorna nada.
+        """
+        fav_data = action.data()
+        if fav_data is not None:
+            self._open_favorite_connection(fav_data)
 
     def _open_favorite_connection(self, fav_data):
         """
         Abre uma conexão RDP a partir dos dados de um favorito em uma nova aba, sem mostrar atributos ao usuário.
         Parâmetros:
-            fav_data (dict): dados da conexão favorita.
+            fav_data (Connection): dados da conexão favorita.
         Não retorna nada.
         """
-        computer_name = self._get_computer_name_from_host(fav_data['host'])
-        widget = RDPWidget(
-            fav_data['host'], fav_data['username'], fav_data['password'],
-            fav_data.get('domain', ''), fav_data.get('port', 3389), fav_data.get('nla', True)
-        )
         # Sempre adiciona a nova aba na última posição
-        self.tab_widget.addTab(widget, computer_name)
-        self.tab_widget.setCurrentWidget(widget)
-        self.setWindowTitle(f"{computer_name} - mTabs")
+        self._add_tab(*fav_data)
 
     def add_favorite(self, name, folder_path, conn_data):
         """
         Adiciona uma conexão aos favoritos, podendo ser dentro de uma pasta.
-        Salva os favoritos criptografados após adicionar.
+        Agenda a gravação dos favoritos criptografados após adicionar.
         Parâmetros:
             name (str): nome personalizado do favorito.
             folder_path (str): caminho da pasta (ex: 'Trabalho/Servidores').
-            conn_data (dict): dados da conexão.
+            conn_data (dict ou Connection): dados da conexão.
         Não retorna nada.
         """
+        self._ensure_favorites_loaded()
+        if not isinstance(conn_data, Connection):
+            conn_data = _make_connection(conn_data)
         parts = [p for p in folder_path.split('/') if p]
         d = self.favorites
         for part in parts:
-            if part not in d:
-                d[part] = {}
-            d = d[part]
+            node = d.get(part)
+            if not isinstance(node, dict):
+                # Pasta nova, ou um favorito no caminho que passa a ser pasta
+                node = d[part] = {}
+            d = node
         d[name] = conn_data
-        self._update_favorites_menu()
-        save_favorites_encrypted(self.favorites)
+        self._add_favorite_menu_item(parts, name, conn_data)
+        self._fav_dirty = True
+        self._fav_flush_timer.start(FAVORITES_SAVE_DELAY_MS)
+
+    @pyqtSlot()
+    def _flush_favorites(self):
+        """
+        Agenda a gravação dos favoritos criptografados, se houver alterações pendentes.
+        A criptografia e a escrita acontecem no pool de gravação, sobre uma cópia dos favoritos.
+        Não recebe parâmetros e não retorna nada.
+        """
+        self._fav_flush_timer.stop()
+        if self._fav_dirty:
+            self._fav_dirty = False
+            snapshot = copy.deepcopy(self.favorites)
+            self._fav_saves_pending += 1
+            self._fav_save_pool.start(_FavoritesSaver(snapshot, self._favorites_saved.emit,
+                                                        self._favorites_save_failed.emit))
 
+    @pyqtSlot(object)
+    def _on_favorites_saved(self, signature):
+        """
+        Registra a assinatura do arquivo gravado por esta janela, para que o aviso de mudança
+        causado pela própria gravação seja ignorado, e volta a observar o arquivo.
+        Parâmetros:
+            signature (tuple): assinatura do arquivo após a gravação (ver _favorites_file_signature).
+        Não retorna nada.
+        """
+        self._fav_saves_pending -= 1
+        self._fav_save_failures = 0
+        self._fav_own_signature = signature
+        self._watch_favorites_file()
+        self._recheck_favorites_file()
+
+    @pyqtSlot(str)
+    def _on_favorites_save_failed(self, error):
+        """
+        Marca os favoritos como pendentes de novo quando a gravação em segundo plano falha
+        e agenda outra tentativa, até FAVORITES_SAVE_RETRIES vezes seguidas. Esgotadas as
+        tentativas, avisa o usuário; a gravação volta a ser tentada na próxima alteração
+        e ao fechar a janela.
+        Parâmetros:
+            error (str): mensagem de erro da gravação.
+        Não retorna nada.
+        """
+        self._fav_saves_pending -= 1
+        self._fav_dirty = True
+        self._recheck_favorites_file()
+        self._fav_save_failures += 1
+        if self._fav_save_failures <= FAVORITES_SAVE_RETRIES:
+            self._fav_flush_timer.start(FAVORITES_RETRY_DELAY_MS)
+            return
+        self._fav_save_failures = 0
+        QMessageBox.warning(self, 'Favoritos', f'Não foi possível salvar os favoritos:\n{error}')
+
+    def _watch_favorites_file(self):
+        """
+        Passa a observar o arquivo de favoritos, se ele existir e ainda não estiver sendo observado.
+        Necessário após o carregamento dos favoritos, após a primeira gravação e após cada
+        substituição do arquivo.
+        Não recebe parâmetros e não retorna nada.
+        """
+        if FAVORITES_FILE not in self._fav_watcher.files() and os.path.exists(FAVORITES_FILE):
+            self._fav_watcher.addPath(FAVORITES_FILE)
+
+    @pyqtSlot(str)
+    def _on_favorites_file_changed(self, path):
+        """
+        Agenda a releitura dos favoritos quando o arquivo muda em disco.
+        Ignora a mudança se os favoritos ainda não foram carregados (serão lidos sob demanda)
+        ou se o arquivo é o gravado por esta própria janela (mesma data de modificação e
+        tamanho), sem abrir o arquivo. Durante uma gravação deste processo, a conferência
+        fica para quando a gravação terminar.
+        Parâmetros:
+            path (str): caminho do arquivo alterado.
+        Não retorna nada.
+        """
+        self._watch_favorites_file()
+        if self.favorites is None:
+            return
+        if self._fav_saves_pending:
+            self._fav_recheck = True
+            return
+        if _favorites_file_signature() != self._fav_own_signature:
+            self._fav_save_pool.start(_FavoritesLoader(self._favorites_reloaded.emit))
+
+    def _recheck_favorites_file(self):
+        """
+        Confere, após a última gravação pendente, uma mudança no arquivo recebida durante
+        a gravação; se o arquivo não for o gravado por esta janela, agenda a releitura.
+        Não recebe parâmetros e não retorna nada.
+        """
+        if self._fav_recheck and not self._fav_saves_pending:
+            self._fav_recheck = False
+            if _favorites_file_signature() != self._fav_own_signature:
+                self._fav_save_pool.start(_FavoritesLoader(self._favorites_reloaded.emit))
+
+    @pyqtSlot(object)
+    def _on_favorites_reloaded(self, reloaded):
+        """
+        Troca os favoritos e o menu pelos relidos do arquivo, se forem diferentes dos atuais.
+        Se há alterações locais ainda não gravadas, as duas versões são juntadas
+        (_merge_favorites) e o resultado é gravado, para não perder nenhuma delas.
+        Parâmetros:
+            reloaded (tuple): (assinatura do arquivo lido, favoritos relidos do arquivo).
+        Não retorna nada.
+        """
+        self._fav_own_signature, favorites = reloaded
+        if self._fav_dirty or self._fav_saves_pending:
+            log.info("Favoritos alterados por outra instância; juntando com as alterações locais")
+            favorites = _merge_favorites(favorites, self.favorites)
+            self._fav_dirty = True
+            self._fav_flush_timer.start(FAVORITES_SAVE_DELAY_MS)
+        if favorites != self.favorites:
+            self.favorites = favorites
+            self._update_favorites_menu()
+
+    def closeEvent(self, event):
+        """
+        Evento chamado ao fechar a janela principal.
+        Garante que favoritos ainda não gravados sejam salvos antes de sair
+        e descarta as resoluções de nome ainda na fila.
+        Parâmetros:
+            event (QCloseEvent): evento de fechamento.
+        Não retorna nada.
+        """
+        self._resolve_pool.clear()
+        self._flush_favorites()
+        self._fav_save_pool.waitForDone()
+        # Entrega já o aviso de falha da última gravação, se houver, para tentar mais uma vez
+        QApplication.sendPostedEvents(self)
+        if self._fav_dirty:
+            self._fav_flush_timer.stop()
+            try:
+                save_favorites_encrypted(self.favorites)
+            except Exception as e:
+                log.error("Erro ao salvar favoritos: %s", e)
+                QMessageBox.warning(self, 'Favoritos', f'Não foi possível salvar os favoritos:\n{e}')
+        super().closeEvent(event)
+
+    @pyqtSlot()
     def add_connection(self):
         """
         Abre uma nova aba com o formulário de nova conexão RDP (NovaConexaoWidget).
         Não recebe parâmetros e não retorna nada.
         """
-        nova_conexao = NovaConexaoWidget(on_connect=self._on_nova_conexao_connect, on_favoritar=self._on_nova_conexao_favoritar)
+        nova_conexao = NovaConexaoWidget()
+        nova_conexao.connect_requested.connect(self._on_nova_conexao_connect)
+        nova_conexao.favorite_requested.connect(self._on_nova_conexao_favoritar)
         self.tab_widget.addTab(nova_conexao, "Nova Conexão")
         self.tab_widget.setCurrentWidget(nova_conexao)
 
+    @pyqtSlot(object)
     def _on_nova_conexao_connect(self, data):
         """
-        Callback para conectar a partir do formulário de nova conexão.
+        Slot do connect_requested do formulário de nova conexão: conecta com os dados informados.
         Parâmetros:
-            data (tuple): dados da conexão (host, username, password, domain, port, nla).
+            data (Connection): dados da conexão (host, username, password, domain, port, nla).
         Não retorna nada.
         """
         host, username, password, domain, port, nla = data
         if not host or not username:
             return
+        form = self.sender()
         self._add_tab(host, username, password, domain, port, nla)
-        # Remove a aba de nova conexão após conectar
-        idx = self.tab_widget.currentIndex()
-        self.tab_widget.removeTab(idx)
+        # Remove a aba do formulário que pediu a conexão (a aba atual já é a nova sessão)
+        self.tab_widget.removeTab(self.tab_widget.indexOf(form))
+        form.deleteLater()
 
+    @pyqtSlot(object)
     def _on_nova_conexao_favoritar(self, fav_data):
         """
-        Callback para favoritar a partir do formulário de nova conexão.
+        Slot do favorite_requested dos formulários de nova conexão: adiciona o favorito.
         Parâmetros:
-            fav_data (tuple): (name, folder, conn_data)
+            fav_data (tuple): (name, folder, conn_data), com conn_data do tipo Connection
         Não retorna nada.
         """
         name, folder, conn_data = fav_data
@@ -598,7 +1257,8 @@ class MTabsMainWindow(QMainWindow):
     def _add_tab(self, host, username, password, domain, port, nla):
         """
         Adiciona uma nova aba com a conexão RDP embutida.
-        O nome da aba e o título da janela exibem o nome do computador remoto.
+        A aba é criada com o host informado e, quando o DNS reverso responder em segundo plano,
+        o nome da aba e o título da janela passam a exibir o nome do computador remoto.
         Parâmetros:
             host (str): endereço do host remoto.
             username (str): nome de usuário.
@@ -610,13 +1270,16 @@ class MTabsMainWindow(QMainWindow):
         """
         computer_name = self._get_computer_name_from_host(host)
         widget = RDPWidget(host, username, password, domain, port, nla)
+        widget.ax_exception.connect(self._on_ax_exception)
         self.tab_widget.addTab(widget, computer_name)
         self.tab_widget.setCurrentWidget(widget)
         self.setWindowTitle(f"{computer_name} - mTabs")
+        self._resolve_computer_name(widget, host)
 
     def _get_computer_name_from_host(self, host, timeout=2.0):
         """
-        Retorna o próprio host informado, sem tentar resolver DNS.
+        Retorna o próprio host informado, sem bloquear a interface resolvendo DNS.
+        A resolução do nome real é feita em segundo plano por _resolve_computer_name.
         Parâmetros:
             host (str): endereço do host remoto (IP ou hostname).
             timeout (float): ignorado, mantido para compatibilidade.
@@ -625,34 +1288,106 @@ class MTabsMainWindow(QMainWindow):
         """
         return host
 
+    def _resolve_computer_name(self, widget, host):
+        """
+        Agenda no pool de resolução da janela a resolução do nome do computador remoto de uma aba.
+        O resultado chega pelo sinal _host_resolved.
+        Parâmetros:
+            widget (QWidget): widget da aba criada para o host.
+            host (str): endereço do host remoto.
+        Não retorna nada.
+        """
+        callback = partial(self._host_resolved.emit, widget)
+        self._resolve_pool.start(_HostnameResolver(host, callback))
+
+    @pyqtSlot(object, str)
+    def _on_host_resolved(self, widget, name):
+        """
+        Atualiza o texto da aba (e o título da janela, se for a aba ativa) com o nome resolvido.
+        Parâmetros:
+            widget (QWidget): widget da aba.
+            name (str): nome do computador remoto.
+        Não retorna nada.
+        """
+        if sip.isdeleted(widget):
+            return
+        index = self.tab_widget.indexOf(widget)
+        if index == -1:
+            return
+        self.tab_widget.setTabText(index, name)
+        if index == self.tab_widget.currentIndex():
+            self._update_window_title(index)
+
+    @pyqtSlot(str, int, str, str, str)
+    def _on_ax_exception(self, host, code, source, desc, help):
+        """
+        Guarda uma exceção do ActiveX de uma aba RDP no buffer limitado de exceções.
+        Parâmetros:
+            host (str): host da aba que gerou a exceção.
+            code (int): código do erro.
+            source (str): fonte do erro.
+            desc (str): descrição do erro.
+            help (str): ajuda adicional.
+        Não retorna nada.
+        """
+        self._ax_exceptions.append((host, code, source, desc, help))
+
+    @pyqtSlot()
+    def _show_ax_exceptions(self):
+        """
+        Exibe em um diálogo as últimas exceções do ActiveX registradas.
+        Não recebe parâmetros e não retorna nada.
+        """
+        dialog = QDialog(self)
+        dialog.setWindowTitle('Exceções RDP')
+        layout = QVBoxLayout(dialog)
+        text = QPlainTextEdit()
+        text.setReadOnly(True)
+        lines = [f"{host}: code={code}, source={source}, desc={desc}, help={help}"
+                 for host, code, source, desc, help in self._ax_exceptions]
+        text.setPlainText('\n'.join(lines) or 'Nenhuma exceção registrada.')
+        layout.addWidget(text)
+        dialog.resize(700, 400)
+        dialog.exec_()
+
+    @pyqtSlot(int)
     def close_tab(self, index):
         """
-        Fecha a aba selecionada.
+        Fecha a aba selecionada. Se for uma conexão RDP, encerra a sessão e libera o controle.
         Parâmetros:
             index (int): índice da aba a ser fechada.
         """
+        widget = self.tab_widget.widget(index)
         self.tab_widget.removeTab(index)
+        if isinstance(widget, RDPWidget):
+            widget.release()
+            widget.deleteLater()
         if self.tab_widget.count() == 0:
             self._show_welcome()
 
     def _show_welcome(self):
         """
-        Exibe o formulário de Nova Conexão como aba inicial.
+        Exibe o formulário de Nova Conexão como aba inicial, com os campos limpos.
         """
         if self.tab_widget.count() == 0:
-            def on_connect(data):
-                host, username, password, domain, port, nla = data
-                if not host or not username:
-                    return
-                self._add_tab(host, username, password, domain, port, nla)
-                self.tab_widget.removeTab(0)  # Remove a aba de nova conexão
-            def on_favoritar(fav_data):
-                name, folder, conn_data = fav_data
-                if name:
-                    self.add_favorite(name, folder, conn_data)
-            nova_conexao = NovaConexaoWidget(on_connect=on_connect, on_favoritar=on_favoritar)
-            self.tab_widget.addTab(nova_conexao, "Nova Conexão")
-            self.tab_widget.setCurrentWidget(nova_conexao)
+            self._welcome_widget.clear_form()
+            self.tab_widget.addTab(self._welcome_widget, "Nova Conexão")
+            self.tab_widget.setCurrentWidget(self._welcome_widget)
+
+    @pyqtSlot(object)
+    def _on_welcome_connect(self, data):
+        """
+        Slot do connect_requested do formulário da aba inicial: conecta com os dados informados.
+        Parâmetros:
+            data (Connection): dados da conexão (host, username, password, domain, port, nla).
+        Não retorna nada.
+        """
+        host, username, password, domain, port, nla = data
+        if not host or not username:
+            return
+        self._add_tab(host, username, password, domain, port, nla)
+        # Remove a aba de nova conexão
+        self.tab_widget.removeTab(self.tab_widget.indexOf(self._welcome_widget))
 
     def set_minimum_size_to_current(self):
         """
@@ -678,21 +1413,27 @@ class NovaConexaoWidget(QWidget):
     """
     Widget de formulário para criar uma nova conexão RDP, exibido dentro de uma aba, com layout moderno e apenas a aba Logon.
     """
-    def __init__(self, parent=None, on_connect=None, on_favoritar=None, on_close_tab=None):
+    # Emitido ao clicar em Conectar, com os dados da conexão (Connection)
+    connect_requested = pyqtSignal(object)
+    # Emitido ao clicar em Salvar como favorito, com (name, folder, conn_data)
+    favorite_requested = pyqtSignal(object)
+    # Emitido ao clicar em Fechar Aba
+    close_tab_requested = pyqtSignal()
+
+    def __init__(self, parent=None):
         """
         Inicializa o formulário de nova conexão.
         Parâmetros:
             parent: widget pai (opcional).
-            on_connect: função callback chamada ao clicar em OK.
-            on_favoritar: função callback chamada ao clicar em Favoritar.
-            on_close_tab: função callback chamada ao clicar em Fechar Aba.
         Não retorna nada.
         """
         super().__init__(parent)
-        self.on_connect = on_connect
-        self.on_favoritar = on_favoritar
-        self.on_close_tab = on_close_tab
-        self.setStyleSheet("background: #ffffff;")
+        # Adia o repaint até todos os campos estarem no layout
+        self.setUpdatesEnabled(False)
+        # Últimos dados emitidos em connect_requested e quando, para descartar cliques repetidos
+        self._last_connect = None
+        self._last_connect_at = 0.0
+        self.setStyleSheet(_WELCOME_STYLE)
         main_layout = QVBoxLayout(self)
         main_layout.setAlignment(Qt.AlignCenter)
         main_layout.setContentsMargins(32, 32, 32, 32)
@@ -701,47 +1442,37 @@ class NovaConexaoWidget(QWidget):
         form_layout = QVBoxLayout(form_widget)
         # Título e mensagem dentro do formulário
         title = QLabel("Nova Conexão")
-        title.setStyleSheet("background: #d3d3d3; font-weight: bold; font-size: 18px; padding: 8px; border: none;")
+        title.setStyleSheet(_WELCOME_TITLE_STYLE)
         title.setAlignment(Qt.AlignCenter)
         form_layout.addWidget(title)
         msg = QLabel("Esta aba ainda não está conectada a um computador remoto.")
         msg.setAlignment(Qt.AlignCenter)
-        msg.setStyleSheet("margin: 18px 0 18px 0; color: #444;")
+        msg.setStyleSheet(_WELCOME_MSG_STYLE)
         form_layout.addWidget(msg)
         # Campos do formulário
         fields_widget = QWidget()
         fields_layout = QFormLayout(fields_widget)
         fields_layout.setLabelAlignment(Qt.AlignRight)
         fields_layout.setFormAlignment(Qt.AlignHCenter | Qt.AlignVCenter)
-        nome_exibicao = QLineEdit()
-        nome_exibicao.setMinimumWidth(515)
-        nome_exibicao.setMaximumWidth(515)
-        fields_layout.addRow("Nome de Exibição:", nome_exibicao)
-        self.host_input = QLineEdit()
-        self.host_input.setMinimumWidth(515)
-        self.host_input.setMaximumWidth(515)
-        fields_layout.addRow("Computador:", self.host_input)
-        self.user_input = QLineEdit()
-        self.user_input.setMinimumWidth(515)
-        self.user_input.setMaximumWidth(515)
-        fields_layout.addRow("Usuário:", self.user_input)
-        self.pass_input = QLineEdit()
+        # Layout desabilitado enquanto as linhas são adicionadas: o cálculo é feito uma vez ao reabilitar
+        fields_layout.setEnabled(False)
+        self.display_name_input = self._add_line_edit(fields_layout, "Nome de Exibição:")
+        self.host_input = self._add_line_edit(fields_layout, "Computador:")
+        self.user_input = self._add_line_edit(fields_layout, "Usuário:")
+        self.pass_input = self._add_line_edit(fields_layout, "Senha:")
+        # O modo Password já desliga o texto preditivo e a composição do método de entrada
         self.pass_input.setEchoMode(QLineEdit.Password)
-        self.pass_input.setMinimumWidth(515)
-        self.pass_input.setMaximumWidth(515)
-        fields_layout.addRow("Senha:", self.pass_input)
-        self.domain_input = QLineEdit()
-        self.domain_input.setMinimumWidth(515)
-        self.domain_input.setMaximumWidth(515)
-        fields_layout.addRow("Domínio:", self.domain_input)
-        self.port_input = QLineEdit()
-        self.port_input.setText('3389')
-        self.port_input.setMinimumWidth(515)
-        self.port_input.setMaximumWidth(515)
-        fields_layout.addRow("Porta RDP:", self.port_input)
+        self.domain_input = self._add_line_edit(fields_layout, "Domínio:")
+        self.port_input = self._add_line_edit(fields_layout, "Porta RDP:", str(RDP_DEFAULT_PORT))
+        self.port_input.setValidator(_port_validator())
+        self.port_input.setInputMethodHints(Qt.ImhDigitsOnly | Qt.ImhPreferNumbers)
         self.nla_checkbox = QCheckBox("Habilitar Autenticação em Nível de Rede (NLA)")
         self.nla_checkbox.setChecked(True)
+        # Estado do NLA guardado em Python, atualizado só quando a caixa muda
+        self._nla = True
+        self.nla_checkbox.toggled.connect(self._on_nla_toggled)
         fields_layout.addRow("", self.nla_checkbox)
+        fields_layout.setEnabled(True)
         form_layout.addWidget(fields_widget)
         # Botões dentro do formulário
         btns_widget = QWidget()
@@ -755,74 +1486,127 @@ class NovaConexaoWidget(QWidget):
         btns_layout.addWidget(self.connect_btn)
         form_layout.addWidget(btns_widget)
         main_layout.addWidget(form_widget, alignment=Qt.AlignCenter)
+        self.setUpdatesEnabled(True)
+
+    @staticmethod
+    def _add_line_edit(layout, label, text=None):
+        """
+        Cria um campo de texto com a largura padrão do formulário e o adiciona como linha do layout.
+        Parâmetros:
+            layout (QFormLayout): layout dos campos.
+            label (str): rótulo da linha.
+            text (str): texto inicial (opcional).
+        Retorna:
+            QLineEdit: campo criado.
+        """
+        line_edit = QLineEdit()
+        if text:
+            line_edit.setText(text)
+        line_edit.setFixedWidth(515)
+        layout.addRow(label, line_edit)
+        return line_edit
+
+    def clear_form(self):
+        """
+        Restaura os campos do formulário para os valores iniciais.
+        Não recebe parâmetros e não retorna nada.
+        """
+        for field in (self.display_name_input, self.host_input, self.user_input, self.pass_input, self.domain_input):
+            field.clear()
+        self.port_input.setText(str(RDP_DEFAULT_PORT))
+        self.nla_checkbox.setChecked(True)
+        # O formulário reaproveitado não deve descartar uma nova conexão ao mesmo host
+        self._last_connect = None
+        self._last_connect_at = 0.0
 
+    @pyqtSlot(bool)
+    def _on_nla_toggled(self, checked):
+        """
+        Atualiza o estado do NLA guardado quando a caixa de seleção muda.
+        Parâmetros:
+            checked (bool): novo estado da caixa.
+        Não retorna nada.
+        """
+        self._nla = checked
+
+    @pyqtSlot()
     def _on_ok_clicked(self):
         """
-        Chama o callback de conexão com os dados do formulário.
+        Emite connect_requested com os dados do formulário.
+        Sem computador informado, apenas avisa o usuário no próprio campo.
+        Um segundo clique com os mesmos dados logo em seguida (ex.: duplo clique) é ignorado,
+        para não abrir duas sessões iguais.
         Não recebe parâmetros e não retorna nada.
         """
-        if self.on_connect:
-            self.on_connect(self.get_data())
+        data = self.get_data()
+        if not data.host:
+            QToolTip.showText(self.host_input.mapToGlobal(QPoint(0, self.host_input.height())),
+                              "Informe o computador.", self.host_input)
+            return
+        now = time.monotonic()
+        if data == self._last_connect and now - self._last_connect_at < CONNECT_REPEAT_INTERVAL:
+            return
+        self._last_connect = data
+        self._last_connect_at = now
+        self.connect_requested.emit(data)
 
+    @pyqtSlot()
     def _on_close_tab_clicked(self):
         """
-        Chama o callback de fechar aba, se fornecido.
+        Emite close_tab_requested.
         Não recebe parâmetros e não retorna nada.
         """
-        if self.on_close_tab:
-            self.on_close_tab()
+        self.close_tab_requested.emit()
 
+    @pyqtSlot()
     def _on_fav_clicked(self):
         """
-        Chama o callback de favoritar com os dados do formulário.
+        Emite favorite_requested com os dados do formulário.
         Não recebe parâmetros e não retorna nada.
         """
-        if self.on_favoritar:
-            self.on_favoritar(self.get_favorite_data())
+        self.favorite_requested.emit(self.get_favorite_data())
 
     def get_favorite_data(self):
         """
         Retorna os dados do favorito.
         Retorna:
-            tuple: (name, folder, conn_data)
+            tuple: (name, folder, conn_data), com conn_data do tipo Connection
         """
-        name = self.host_input.text().strip() or "Favorito"
-        folder = ""
-        host, username, password, domain, port, nla = self.get_data()
-        return (name, folder, {
-            'host': host,
-            'username': username,
-            'password': password,
-            'domain': domain,
-            'port': port,
-            'nla': nla
-        })
+        conn_data = self.get_data()
+        return (conn_data.host or FAVORITE_DEFAULT_NAME, "", conn_data)
 
     def get_data(self):
         """
-        Retorna os dados inseridos pelo usuário.
+        Retorna os dados inseridos pelo usuário, lendo cada campo uma única vez.
         Retorna:
-            tuple: (host, username, password, domain, port, nla)
-        """
-        host = self.host_input.text().strip()
-        username = self.user_input.text().strip()
-        password = self.pass_input.text()
-        domain = self.domain_input.text().strip()
-        try:
-            port = int(self.port_input.text())
-        except ValueError:
-            port = 3389
-        nla = self.nla_checkbox.isChecked()
-        return (host, username, password, domain, port, nla)
+            Connection: (host, username, password, domain, port, nla)
+        """
+        # O validador só deixa passar dígitos; vazio ou fora da faixa usa a porta padrão
+        port = int(self.port_input.text()) if self.port_input.hasAcceptableInput() else RDP_DEFAULT_PORT
+        return Connection(
+            self.host_input.text().strip(),
+            self.user_input.text().strip(),
+            self.pass_input.text(),
+            self.domain_input.text().strip(),
+            port,
+            self._nla
+        )
 
 def main():
     """
     Função principal para iniciar o aplicativo mTabs (Qt).
+    Retorna:
+        int: código de saída do loop de eventos.
     """
-    app = QApplication(sys.argv)
+    # Reaproveita o QApplication se o módulo for usado dentro de outro processo Qt
+    app = QApplication.instance()
+    if app is None:
+        # Só tem efeito se definido antes de criar o QApplication
+        QApplication.setAttribute(Qt.AA_DisableWindowContextHelpButton, True)
+        app = QApplication(sys.argv)
     window = MTabsMainWindow()
     window.show()
-    sys.exit(app.exec_())
+    return app.exec_()
 
 if __name__ == '__main__':
-    main()
+    raise SystemExit(main())